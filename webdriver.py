@@ -1,15 +1,21 @@
 import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import pandas as pd
 import time
 import os
 import re
+import string
+import csv
+import hashlib
+import queue
+import threading
+import trio
+from concurrent.futures import ThreadPoolExecutor
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
 
 # Expanded patterns for different formats of nutritional information
-NUTRITION_PATTERNS = {
+RAW_NUTRITION_PATTERNS = {
     'calories': [
         r'\d+\s*(?:calories|cals?|kcals?|cal\b)',
         r'(?:calories|cals?|kcals?|cal\b)[\s:]+\d+',
@@ -38,18 +44,130 @@ NUTRITION_PATTERNS = {
     ]
 }
 
+def single_line_pattern(pattern):
+    """Stop whitespace in a pattern from matching across line breaks"""
+    return pattern.replace(r'[\s:]', r'(?:[^\S\n]|:)').replace(r'\s', r'[^\S\n]')
+
+# All patterns fused into one alternation so the page text is scanned once;
+# the group name (field__index) records which field a match belongs to.
+# The patterns are lowercase and run against lowercased text, so no IGNORECASE.
+# Serving size patterns take everything up to the next comma, so they run as
+# lookaheads: the label is recorded without consuming the values that follow it
+COMBINED_NUTRITION_PATTERN = re.compile(
+    '|'.join(
+        f'(?=(?P<{field}__{i}>{single_line_pattern(pattern)}))' if field == 'serving_size'
+        else f'(?P<{field}__{i}>{single_line_pattern(pattern)})'
+        for field, patterns in RAW_NUTRITION_PATTERNS.items()
+        for i, pattern in enumerate(patterns)
+    )
+)
+ASCII_LOWERCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+SERVING_LABEL_PATTERN = re.compile(r'^(serving size|per serving|portion size)[\s:]+', re.IGNORECASE)
+NON_BLANK_PATTERN = re.compile(r'\S')
+DIGIT_PATTERN = re.compile(r'\d')
+VARIANT_NAME_PATTERN = re.compile(r'^(.*) \(Variant (\d+)\)$')
+
+# Fonts and video the scraper never reads; only the page text is used. Images are
+# blocked by content type in setup_driver instead, since image extensions also turn up
+# in page and API URLs. Stylesheets stay allowed because innerText depends on layout
+# (hidden elements would leak in). Patterns match the whole URL, so each extension is
+# anchored at the end of the path, with or without a query string
+BLOCKED_URL_PATTERNS = [
+    pattern
+    for extension in ('woff', 'woff2', 'ttf', 'otf', 'mp4', 'webm')
+    for pattern in (f'*.{extension}', f'*.{extension}?*')
+]
+
+# Lines searched on either side of a nutrition line for the product name
+PRODUCT_NAME_WINDOW = 5
+
+# Column order for a new CSV; an existing file keeps its own header
+CSV_FIELDNAMES = ['name', 'calories', 'protein', 'carbs', 'fat', 'serving_size', 'last_updated', 'source_url']
+
+# Every pattern above contains one of these, so text without any of them can be skipped
+NUTRITION_KEYWORDS = ('cal', 'prot', 'carb', 'fat', 'serving', 'portion', 'energy')
+
+# Pages stuck short of readyState 'complete' (hanging third-party scripts, long-polls)
+# are scraped anyway once their body has text and this much time has passed
+READY_STATE_TIMEOUT_MS = 3000
+
+# Give dynamic content and popups time to render: the page counts as settled once
+# the DOM has had no mutations for CONTENT_QUIET_MS, or after CONTENT_SETTLE_MS at most
+CONTENT_QUIET_MS = 500
+CONTENT_SETTLE_MS = 3000
+
+# Runs in the browser: waits for the page to settle, then sends back only the lines
+# that can carry nutritional information plus the surrounding lines searched for a
+# product name. Each run of skipped non-blank lines is collapsed into a single '-'
+# line so the product context is still reset between separate nutrition blocks.
+CANDIDATE_TEXT_SCRIPT = """
+const [context, keywords, quietMs, settleMs, done] = arguments;
+
+function collect() {
+    const lines = document.body.innerText.split('\\n');
+    const keep = new Array(lines.length).fill(false);
+    lines.forEach((line, i) => {
+        const lower = line.toLowerCase();
+        if (keywords.some(keyword => lower.includes(keyword))) {
+            const end = Math.min(lines.length - 1, i + context);
+            for (let j = Math.max(0, i - context); j <= end; j++) {
+                keep[j] = true;
+            }
+        }
+    });
+    const result = [];
+    let skipped = false;
+    lines.forEach((line, i) => {
+        if (keep[i]) {
+            if (skipped) {
+                result.push('-');
+                skipped = false;
+            }
+            result.push(line);
+        } else if (line.trim()) {
+            skipped = true;
+        }
+    });
+    return result.join('\\n');
+}
+
+let finished = false;
+let quietTimer = setTimeout(finish, quietMs);
+const settleTimer = setTimeout(finish, settleMs);
+const observer = new MutationObserver(() => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(finish, quietMs);
+});
+observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+
+function finish() {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(settleTimer);
+    done(collect());
+}
+"""
+
 def wait_for_content(driver, timeout=20):
-    """Wait for content to load on the page"""
+    """Wait for content to load on the page and return its candidate text, or None on timeout"""
     try:
-        WebDriverWait(driver, timeout).until(
-            lambda d: len(d.find_element(By.TAG_NAME, "body").text.strip()) > 0
+        started = time.monotonic()
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(
+                "return (arguments[0] || document.readyState === 'complete') && "
+                "!!document.body && document.body.innerText.trim().length > 0",
+                (time.monotonic() - started) * 1000 >= READY_STATE_TIMEOUT_MS)
         )
-        # Wait for dynamic content and potential popups
-        time.sleep(5)
-        return True
+        return driver.execute_async_script(
+            CANDIDATE_TEXT_SCRIPT, PRODUCT_NAME_WINDOW, NUTRITION_KEYWORDS, CONTENT_QUIET_MS, CONTENT_SETTLE_MS)
     except TimeoutException:
         print(f"Timeout waiting for content after {timeout} seconds")
-        return False
+        return None
 
 def setup_driver():
     try:
@@ -57,6 +175,8 @@ def setup_driver():
         chrome_options = uc.ChromeOptions()
         chrome_options.add_argument('--start-maximized')
         chrome_options.add_argument('--disable-popup-blocking')
+        # Don't download images; the scraper only reads page text
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
 
         # Only set Chrome binary path on Windows
         if os.name == 'nt':  # Windows systems
@@ -64,60 +184,121 @@ def setup_driver():
             print(f"Chrome binary path: {chrome_binary_path}")
             chrome_options.binary_location = chrome_binary_path
 
-        driver = uc.Chrome(options=chrome_options)
+        # keep_alive=True is already the default; it is spelled out because the
+        # monitoring loop relies on reusing the connection to chromedriver
+        driver = uc.Chrome(options=chrome_options, keep_alive=True)
+
+        # Pages load faster without fonts and video
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"Could not block fonts and video: {str(e)}")
+
         print("Chrome driver setup successful!")
         return driver
     except Exception as e:
         print(f"Error setting up Chrome driver: {str(e)}")
         raise
 
-def extract_number(text, patterns):
-    """Extract the first number found in text that matches any of the patterns"""
-    if not text:
-        return None
-    text = text.lower()
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
+def start_navigation_listener(driver, navigations):
+    """Push the URL of every top-level navigation onto the navigations queue as
+    Chrome DevTools reports it; None is pushed once events are no longer available"""
+    async def listen():
+        async with driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            await session.execute(devtools.page.enable())
+            frame_tree = await session.execute(devtools.page.get_frame_tree())
+            main_frame_id = frame_tree.frame.id
+
+            async for event in session.listen(devtools.page.FrameNavigated, devtools.page.NavigatedWithinDocument):
+                if isinstance(event, devtools.page.FrameNavigated):
+                    if event.frame.parent_id is None:
+                        navigations.put(event.frame.url + (event.frame.url_fragment or ''))
+                elif event.frame_id == main_frame_id:
+                    navigations.put(event.url)
+
+    def run():
+        try:
+            trio.run(listen)
+        except Exception as e:
+            print(f"Navigation events unavailable: {str(e)}")
+        navigations.put(None)
+
+    threading.Thread(target=run, daemon=True).start()
+
+def extract_serving_size(text):
+    """Extract serving size information from a matched serving size label"""
+    # Remove the label part
+    serving_info = SERVING_LABEL_PATTERN.sub('', text)
+    return serving_info.strip()
+
+def find_nutrition_lines(text):
+    """Yield (line_index, line_start, values) for each line of text carrying nutritional information,
+    keeping the first match for each field on a line"""
+    # Match offsets in the lowercased copy must line up with text; str.lower() can
+    # lengthen a few non-ASCII characters, so fall back to lowercasing ASCII only
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        lowered = text.translate(ASCII_LOWERCASE)
+
+    # Fail fast, without running the regex engine, when no keyword appears at all
+    if not any(keyword in lowered for keyword in NUTRITION_KEYWORDS):
+        return
+
+    line_index = 0
+    line_start = 0
+    values = {}
+    for match in COMBINED_NUTRITION_PATTERN.finditer(lowered):
+        match_line_start = text.rfind('\n', 0, match.start()) + 1
+        if match_line_start != line_start:
+            if any(values.values()):
+                yield line_index, line_start, values
+            line_index += text.count('\n', line_start, match_line_start)
+            line_start = match_line_start
+            values = {}
+
+        field = match.lastgroup.split('__')[0]
+        if field in values:
+            continue
+        if field == 'serving_size':
+            # Serving sizes keep the page's original capitalisation
+            start, end = match.span(match.lastgroup)
+            serving_size = extract_serving_size(text[start:end])
+            # A bare label leaves nothing; a later label on the line may still have a value
+            if serving_size:
+                values[field] = serving_size
+        else:
             # Find the first number in the matched text
-            number = re.search(r'\d+(?:\.\d+)?', match.group())
+            number = NUMBER_PATTERN.search(match.group())
             if number:
-                return number.group()
-    return None
+                values[field] = number.group()
 
-def extract_serving_size(text, patterns):
-    """Extract serving size information"""
-    if not text:
-        return None
-    text = text.lower()
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            # Return the full match without the label
-            serving_info = match.group()
-            # Remove the label part
-            serving_info = re.sub(r'^(serving size|per serving|portion size)[\s:]+', '', serving_info, flags=re.IGNORECASE)
-            return serving_info.strip()
-    return None
+    if any(values.values()):
+        yield line_index, line_start, values
+
+def find_product_name(lines, current_index, window_size=PRODUCT_NAME_WINDOW, candidates=None):
+    """Find the most likely product name by looking at surrounding lines.
+    Pass the same candidates dict for every call on a page so overlapping
+    windows don't screen the same line twice."""
+    if candidates is None:
+        candidates = {}
 
-def find_product_name(lines, current_index, window_size=5):
-    """Find the most likely product name by looking at surrounding lines"""
-    potential_names = []
+    def candidate(index):
+        # Stripped line if it could be a product name, otherwise None
+        if index not in candidates:
+            line = lines[index].strip()
+            candidates[index] = line if len(line) > 3 and not DIGIT_PATTERN.search(line) else None
+        return candidates[index]
 
     # Look at previous lines
     start_idx = max(0, current_index - window_size)
-    for line in lines[start_idx:current_index]:
-        line = line.strip()
-        if line and len(line) > 3 and not any(char.isdigit() for char in line):
-            potential_names.append(line)
+    potential_names = [name for name in map(candidate, range(start_idx, current_index)) if name]
 
     # If no names found in previous lines, look at following lines
     if not potential_names and current_index + 1 < len(lines):
         end_idx = min(len(lines), current_index + window_size)
-        for line in lines[current_index + 1:end_idx]:
-            line = line.strip()
-            if line and len(line) > 3 and not any(char.isdigit() for char in line):
-                potential_names.append(line)
+        potential_names = [name for name in map(candidate, range(current_index + 1, end_idx)) if name]
 
     return potential_names[-1] if potential_names else None
 
@@ -125,101 +306,151 @@ def load_existing_data():
     """Load existing data from CSV if it exists"""
     try:
         if os.path.exists('nutritional_info.csv'):
-            df = pd.read_csv('nutritional_info.csv')
-            return {row['name']: row.to_dict() for _, row in df.iterrows()}
+            # Rows are appended as products change, so later rows win. Values are kept
+            # as the strings written, like freshly scraped ones, rather than floats/NaN
+            df = pd.read_csv('nutritional_info.csv', engine='c', dtype=str, keep_default_na=False)
+            df = df.drop_duplicates('name', keep='last')
+            return df.set_index('name', drop=False).to_dict(orient='index')
         return {}
     except Exception as e:
         print(f"Error loading existing data: {str(e)}")
         return {}
 
-def save_to_csv(products_data):
-    """Save the current data to CSV"""
+def canonical_value(value):
+    """Normalize a nutritional value so stored and scraped forms compare equal ('302.0' and '302')"""
+    if value in (None, '', 'N/A'):
+        return 'N/A'
     try:
-        df = pd.DataFrame(list(products_data.values()))
-        df.to_csv('nutritional_info.csv', index=False)
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    return str(int(number)) if number.is_integer() else repr(number)
+
+def nutrition_fingerprint(product):
+    """Nutritional values that tell variants of a product apart"""
+    return (canonical_value(product.get('calories')), canonical_value(product.get('protein')),
+            canonical_value(product.get('carbs')), canonical_value(product.get('fat')))
+
+def register_product(variant_index, name, fingerprint, base_name=None):
+    """Record that name holds fingerprint, both as its own base name and,
+    for a variant, under the name it is a variant of"""
+    entry = variant_index.setdefault(name, {'fingerprints': {}, 'next_suffix': 1})
+    entry['fingerprints'][fingerprint] = name
+    if base_name is not None:
+        entry = variant_index.setdefault(base_name, {'fingerprints': {}, 'next_suffix': 1})
+        entry['fingerprints'].setdefault(fingerprint, name)
+
+def build_variant_index(products_data):
+    """Index products by base name and fingerprint so variants are found without scanning"""
+    variant_index = {}
+    for name, product in products_data.items():
+        match = VARIANT_NAME_PATTERN.match(name)
+        base_name = match.group(1) if match else None
+        register_product(variant_index, name, nutrition_fingerprint(product), base_name)
+        if match:
+            entry = variant_index[base_name]
+            entry['next_suffix'] = max(entry['next_suffix'], int(match.group(2)) + 1)
+    return variant_index
+
+def resolve_product_name(variant_index, base_name, fingerprint):
+    """Return the name to store these values under: the base name or a variant
+    with the same values if one exists, otherwise a new variant"""
+    entry = variant_index.get(base_name)
+    if entry is None:
+        register_product(variant_index, base_name, fingerprint)
+        return base_name
+
+    name = entry['fingerprints'].get(fingerprint)
+    if name is None:
+        # No matching variant found, create new one
+        name = f"{base_name} (Variant {entry['next_suffix']})"
+        entry['next_suffix'] += 1
+        register_product(variant_index, name, fingerprint, base_name)
+    return name
+
+def open_csv_writer():
+    """Open the CSV for appending, writing the header if the file is new"""
+    file_exists = os.path.exists('nutritional_info.csv') and os.path.getsize('nutritional_info.csv') > 0
+    fieldnames = CSV_FIELDNAMES
+    if file_exists:
+        # Keep the column order of the existing file
+        with open('nutritional_info.csv', newline='', encoding='utf-8') as f:
+            fieldnames = next(csv.reader(f))
+
+    csv_file = open('nutritional_info.csv', 'a', newline='', encoding='utf-8')
+    # The tracked CSV uses LF line endings; DictWriter defaults to CRLF
+    csv_writer = csv.DictWriter(csv_file, fieldnames=fieldnames, extrasaction='ignore', lineterminator='\n')
+    if not file_exists:
+        csv_writer.writeheader()
+        csv_file.flush()
+    return csv_file, csv_writer
+
+def save_to_csv(csv_file, csv_writer, products_data, updated_names):
+    """Append the products updated on this page to the CSV"""
+    try:
+        csv_writer.writerows(products_data[name] for name in updated_names)
+        csv_file.flush()
         print(f"\nData saved successfully! Total unique products: {len(products_data)}")
     except Exception as e:
         print(f"Error saving data: {str(e)}")
 
-def process_page_content(driver, products_data, current_url):
-    """Process the content of the current page"""
+def process_page_content(products_data, variant_index, current_url, page_text, csv_file, csv_writer):
+    """Process the content of the current page, given its candidate text"""
     try:
-        # First try to find nutrition tables or specific nutrition sections
-        nutrition_elements = driver.find_elements(By.XPATH,
-            "//*[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'nutrition') or "
-            "contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'nutritional')]")
-
-        page_text = driver.find_element(By.TAG_NAME, "body").text
+        # Every product found on this page shares the same timestamp
+        last_updated = time.strftime('%Y-%m-%d %H:%M:%S')
         lines = page_text.split('\n')
         current_product = None
         products_found_on_page = 0
-
-        # Process each line
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Extract nutritional information
-            calories = extract_number(line, NUTRITION_PATTERNS['calories'])
-            protein = extract_number(line, NUTRITION_PATTERNS['protein'])
-            carbs = extract_number(line, NUTRITION_PATTERNS['carbs'])
-            fat = extract_number(line, NUTRITION_PATTERNS['fat'])
-            serving_size = extract_serving_size(line, NUTRITION_PATTERNS['serving_size'])
-
-            # If we found any nutritional info
-            if any([calories, protein, carbs, fat, serving_size]):
-                if not current_product:
-                    current_product = find_product_name(lines, i)
-
-                if current_product:
-                    # Create a nutritional values string for comparison
-                    current_values = f"cal{calories or 'NA'}_p{protein or 'NA'}_c{carbs or 'NA'}_f{fat or 'NA'}"
-                    base_name = current_product
-
-                    # Check if this product name exists with different nutritional values
-                    if base_name in products_data:
-                        existing_data = products_data[base_name]
-                        existing_values = f"cal{existing_data.get('calories', 'NA')}_p{existing_data.get('protein', 'NA')}_c{existing_data.get('carbs', 'NA')}_f{existing_data.get('fat', 'NA')}"
-
-                        if existing_values != current_values:
-                            # Find a unique name by adding a suffix
-                            suffix = 1
-                            while f"{base_name} (Variant {suffix})" in products_data:
-                                variant_data = products_data[f"{base_name} (Variant {suffix})"]
-                                variant_values = f"cal{variant_data.get('calories', 'NA')}_p{variant_data.get('protein', 'NA')}_c{variant_data.get('carbs', 'NA')}_f{variant_data.get('fat', 'NA')}"
-
-                                if variant_values == current_values:
-                                    # Found matching variant, use this name
-                                    current_product = f"{base_name} (Variant {suffix})"
-                                    break
-                                suffix += 1
-                            else:
-                                # No matching variant found, create new one
-                                current_product = f"{base_name} (Variant {suffix})"
-
-                    # Update or create product entry
-                    products_data[current_product] = {
-                        'name': current_product,
-                        'calories': calories or 'N/A',
-                        'protein': protein or 'N/A',
-                        'carbs': carbs or 'N/A',
-                        'fat': fat or 'N/A',
-                        'serving_size': serving_size or 'N/A',
-                        'last_updated': time.strftime('%Y-%m-%d %H:%M:%S'),
-                        'source_url': current_url
-                    }
-                    products_found_on_page += 1
-                    print(f"\nFound/Updated product: {current_product}")
-                    print(f"Values - Calories: {calories}, Protein: {protein}, Carbs: {carbs}, Fat: {fat}")
-                    print(f"Serving Size: {serving_size}")
-            else:
-                # Reset product context if we've moved past nutritional information
+        previous_line_end = 0
+        name_candidates = {}
+        updated_names = set()
+
+        # Only lines with nutritional information are visited; the line index
+        # gives find_product_name its context
+        for i, line_start, values in find_nutrition_lines(page_text):
+            # Reset product context if we've moved past nutritional information
+            if NON_BLANK_PATTERN.search(page_text, previous_line_end, line_start):
                 current_product = None
+            previous_line_end = line_start + len(lines[i])
+
+            calories = values.get('calories')
+            protein = values.get('protein')
+            carbs = values.get('carbs')
+            fat = values.get('fat')
+            serving_size = values.get('serving_size')
+
+            if not current_product:
+                current_product = find_product_name(lines, i, candidates=name_candidates)
+
+            if current_product:
+                product = {
+                    'name': current_product,
+                    'calories': calories or 'N/A',
+                    'protein': protein or 'N/A',
+                    'carbs': carbs or 'N/A',
+                    'fat': fat or 'N/A',
+                    'serving_size': serving_size or 'N/A',
+                    'last_updated': last_updated,
+                    'source_url': current_url
+                }
+
+                # Reuse the name holding these exact values, or allocate a variant name;
+                # the fingerprint is built by the same function used to index stored products
+                current_product = resolve_product_name(variant_index, current_product, nutrition_fingerprint(product))
+                product['name'] = current_product
+
+                # Update or create product entry
+                products_data[current_product] = product
+                updated_names.add(current_product)
+                products_found_on_page += 1
+                print(f"\nFound/Updated product: {current_product}")
+                print(f"Values - Calories: {calories}, Protein: {protein}, Carbs: {carbs}, Fat: {fat}")
+                print(f"Serving Size: {serving_size}")
 
         if products_found_on_page > 0:
             print(f"\nFound {products_found_on_page} products on this page")
-            save_to_csv(products_data)
+            save_to_csv(csv_file, csv_writer, products_data, updated_names)
         else:
             print("\nNo nutritional information found on this page")
 
@@ -231,27 +462,59 @@ def process_page_content(driver, products_data, current_url):
 def continuous_scraping():
     """Continuously monitor and scrape data from pages as they are visited"""
     driver = None
+    csv_file = None
     products_data = load_existing_data()
+    variant_index = build_variant_index(products_data)
     last_url = None
+    navigations = queue.Queue()
+    use_navigation_events = True
+    page_hashes = {}  # URL -> hash of the text last processed for it
+    # Pages are parsed and saved on a worker thread so the browser is watched again
+    # as soon as a page's text is fetched. A single worker keeps products_data and
+    # variant_index owned by one thread and pages saved in the order they were visited.
+    page_worker = ThreadPoolExecutor(max_workers=1)
 
     try:
+        csv_file, csv_writer = open_csv_writer()
         driver = setup_driver()
         print("\nStarting continuous monitoring...")
         print("Navigate to any page in the browser, and I'll automatically scrape nutritional information.")
         print("Press Ctrl+C to stop the script.")
+        start_navigation_listener(driver, navigations)
 
         while True:
             try:
-                current_url = driver.current_url
+                if use_navigation_events:
+                    # Block until the browser reports a navigation, skipping to the latest one
+                    try:
+                        current_url = navigations.get(timeout=1)
+                    except queue.Empty:
+                        continue
+                    while current_url is not None and not navigations.empty():
+                        current_url = navigations.get_nowait()
+                    if current_url is None:
+                        print("Falling back to checking for new URLs every 2 seconds")
+                        use_navigation_events = False
+                        continue
+                else:
+                    current_url = driver.current_url
 
                 # Only process if we've navigated to a new URL
                 if current_url != last_url:
                     print(f"\nNew page detected: {current_url}")
-                    if wait_for_content(driver):
-                        process_page_content(driver, products_data, current_url)
+                    page_text = wait_for_content(driver)
+                    if page_text is not None:
+                        page_hash = hashlib.blake2b(page_text.encode(), digest_size=16).digest()
+                        if page_hashes.get(current_url) == page_hash:
+                            print("Page content unchanged since the last visit, skipping")
+                        else:
+                            page_hashes[current_url] = page_hash
+                            page_worker.submit(process_page_content, products_data, variant_index,
+                                               current_url, page_text, csv_file, csv_writer)
                     last_url = current_url
 
-                time.sleep(2)  # Check for new URLs every 2 seconds
+                if not use_navigation_events:
+                    time.sleep(2)  # Check for new URLs every 2 seconds
 
             except Exception as e:
                 print(f"Error during monitoring: {str(e)}")
@@ -268,6 +531,10 @@ def continuous_scraping():
     finally:
         if driver:
             driver.quit()
+        # Let pages that were already fetched finish saving
+        page_worker.shutdown(wait=True)
+        if csv_file:
+            csv_file.close()
 
 if __name__ == "__main__":
     print("Starting the continuous scraping process...")